@@ -0,0 +1,28 @@
+# cython: boundscheck=False, wraparound=False
+"""
+dhash_kernel.pyx – noyau C optionnel pour le calcul du dHash.
+
+Compilé avec `python setup_kernel.py build_ext --inplace`. S'il n'est pas
+compilé, utilities._hash_batch retombe sur le chemin NumPy équivalent.
+"""
+
+
+def dhash_batch(const unsigned char[:, :, ::1] imgs,
+                unsigned long long[::1] out):
+    """
+    Empaquette le dHash 64 bits de chaque image 8×9 de `imgs` dans `out`.
+
+    Une seule passe sur N*72 octets, sans tableau booléen intermédiaire :
+    la comparaison de colonnes est directement insérée dans le mot 64 bits.
+    """
+    cdef Py_ssize_t n = imgs.shape[0]
+    cdef Py_ssize_t i, r, c
+    cdef unsigned long long h
+    with nogil:
+        for i in range(n):
+            h = 0
+            for r in range(8):
+                for c in range(8):
+                    h = (h << 1) | (1 if imgs[i, r, c + 1] > imgs[i, r, c]
+                                    else 0)
+            out[i] = h
@@ -0,0 +1,23 @@
+"""
+setup_kernel.py – compile le noyau Cython optionnel dhash_kernel.pyx.
+
+Usage : python setup_kernel.py build_ext --inplace
+L'application fonctionne sans : utilities._hash_batch utilise alors le
+chemin NumPy équivalent.
+"""
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+setup(
+    ext_modules=cythonize(
+        [
+            Extension(
+                "dhash_kernel",
+                ["dhash_kernel.pyx"],
+                extra_compile_args=["-O3", "-march=native"],
+            )
+        ],
+        language_level=3,
+    ),
+)